@@ -310,9 +310,7 @@ def Generate_Library(
                                             Sol_NN                      = Sol_NN,
                                             Time_Derivative_Order       = Time_Derivative_Order,
                                             Spatial_Derivative_Order    = Spatial_Derivative_Order,
-                                            Coords                      = Coords[i:(i + Batch_Size)],
-                                            Data_Type                   = torch.float32,
-                                            Device                      = Device);
+                                            Coords                      = Coords[i:(i + Batch_Size)]);
 
             Dtm_U[i:(i + Batch_Size)]    = Dtm_U_Batch.detach();
             Dxn_U[i:(i + Batch_Size), :] = Dxn_U_Batch.detach();
@@ -322,9 +320,7 @@ def Generate_Library(
                                         Sol_NN                      = Sol_NN,
                                         Time_Derivative_Order       = Time_Derivative_Order,
                                         Spatial_Derivative_Order    = Spatial_Derivative_Order,
-                                        Coords                      = Coords[(i + Batch_Size):],
-                                        Data_Type                   = torch.float32,
-                                        Device                      = Device);
+                                        Coords                      = Coords[(i + Batch_Size):]);
 
         Dtm_U[(i + Batch_Size):]    = Dtm_U_Batch.detach();
         Dxn_U[(i + Batch_Size):, :] = Dxn_U_Batch.detach();
@@ -334,9 +330,7 @@ def Generate_Library(
                             Sol_NN                      = Sol_NN,
                             Time_Derivative_Order       = Time_Derivative_Order,
                             Spatial_Derivative_Order    = Spatial_Derivative_Order,
-                            Coords                      = Coords,
-                            Data_Type                   = torch.float32,
-                            Device                      = Device);
+                            Coords                      = Coords);
         Dtm_U = Dtm_U.detach();
         Dxn_U = Dxn_U.detach();
 
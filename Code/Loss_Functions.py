@@ -3,7 +3,46 @@ import torch;
 
 from Network        import Neural_Network;
 from PDE_Residual   import PDE_Residual;
-from typing         import Tuple;
+from typing         import Tuple, List;
+
+
+
+# Evaluates Sol_NN at several sets of coordinates in one batch.
+def Fused_Forward(
+        Sol_NN      : Neural_Network,
+        Coords_List : List[torch.Tensor]) -> List[torch.Tensor]:
+    """ This function evaluates Sol_NN at every set of coordinates in
+    Coords_List using a single forward pass. To do this, we concatenate the
+    coordinates into one big batch, pass that batch through Sol_NN, and then
+    split the output back up. This replaces several small matrix
+    multiplications (one set per forward pass) with a few big ones, which is
+    much faster when Sol_NN is small.
+
+    Note: The coordinates are concatenated (not copied out of the graph). Thus,
+    if one of the coordinate tensors requires grad, then we can differentiate
+    the corresponding output with respect to it. If you want to do that, set
+    requires_grad before calling this function.
+
+    ----------------------------------------------------------------------------
+    Arguments:
+
+    Sol_NN: The network that approximates the PDE solution.
+
+    Coords_List: A list of coordinate tensors. Each one should have the same
+    number of columns (Sol_NN's input dimension).
+
+    ----------------------------------------------------------------------------
+    Returns:
+
+    A list whose ith element holds Sol_NN evaluated at Coords_List[i]. If
+    Coords_List[i] has N rows, then the ith element is an N by 1 Tensor. """
+
+    # Record how many rows are in each set of coordinates.
+    Sizes : List[int] = [Coords.shape[0] for Coords in Coords_List];
+
+    # Evaluate Sol_NN at all coordinates at once, then split up the result.
+    U = Sol_NN(torch.cat(Coords_List, dim = 0));
+    return list(torch.split(U, Sizes, dim = 0));
 
 
 
@@ -14,8 +53,7 @@ def Collocation_Loss(
         Time_Derivative_Order       : int,
         Spatial_Derivative_Order    : int,
         Collocation_Coords          : torch.Tensor,
-        Data_Type                   : torch.dtype = torch.float32,
-        Device                      : torch.device = torch.device('cpu')) -> torch.Tensor:
+        U                           : torch.Tensor = None) -> torch.Tensor:
     """ This function evaluates how well Sol_NN satisfies the learned PDE at the
     collocation points. For brevity, let u = Sol_NN and N = PDE_NN. At each
     collocation point, we compute the following:
@@ -41,9 +79,9 @@ def Collocation_Loss(
     Collocation_Coords: This should be a 2 column Tensor whose ith row holds the
     t, x coordinates of the ith collocation point.
 
-    Data_Type: The data type that all Tensors in Sol_NN and PDE_NN use.
-
-    Device: The device that we loaded Sol_NN and PDE_NN on.
+    U: If this is not None, then it should hold Sol_NN evaluated at
+    Collocation_Coords (see Fused_Forward). In this case, we don't evaluate
+    Sol_NN again.
 
     ----------------------------------------------------------------------------
     Returns:
@@ -58,8 +96,7 @@ def Collocation_Loss(
                                 Time_Derivative_Order       = Time_Derivative_Order,
                                 Spatial_Derivative_Order    = Spatial_Derivative_Order,
                                 Coords                      = Collocation_Coords,
-                                Data_Type                   = Data_Type,
-                                Device                      = Device);
+                                U                           = U);
 
     # Return the mean square residual.
     return (Residual ** 2).mean();
@@ -68,11 +105,10 @@ def Collocation_Loss(
 
 # Loss from the training data.
 def Data_Loss(
-        Sol_NN        : Neural_Network,
+        Sol_NN      : Neural_Network,
         Data_Coords : torch.Tensor,
         Data_Values : torch.Tensor,
-        Data_Type   : torch.dtype = torch.float32,
-        Device      : torch.device = torch.device('cpu')) -> torch.Tensor:
+        U           : torch.Tensor = None) -> torch.Tensor:
     """ This function evaluates how well Sol_NN satisfies the training data.
     Specifically, for Data point (t_i, X_i), we compute the square of the
     difference between u_i (the true solution at (t_i, X_i)) and
@@ -97,10 +133,13 @@ def Data_Loss(
     Tensor whose ith element holds the value of the true solution at the ith
     data point.
 
-    Data_Type: The data type that all Tensors use. All Tensors in Sol_NN should
-    use this data type.
+    U: If this is not None, then it should hold Sol_NN evaluated at
+    Data_Coords (see Fused_Forward). In this case, we don't evaluate Sol_NN
+    again.
 
-    Device: The device that we loaded Sol_NN on.
+    Note: Data_Coords and Data_Values should live on the same device as Sol_NN.
+    Data_Coords should use the same data type as Sol_NN. Data_Values can use a
+    lower precision data type (such as bfloat16).
 
     ----------------------------------------------------------------------------
     Returns:
@@ -111,12 +150,19 @@ def Data_Loss(
     # Pass the batch of IC Coordinates through the Neural Network. Note that
     # this will output an N by 1 Tensor (where N is the number of  coordinates).
     # We need it to be a one-dimensional Tensor, so we squeeze out the extra
-    # dimension.
-    u_approx_batch = Sol_NN(Data_Coords).squeeze();
-
-    # Compute the square error at each coordinate.
-    u_true_batch        = Data_Values;
-    Square_Error_Batch  = (u_approx_batch - u_true_batch) ** 2;
-
-    # Return the mean square error.
-    return Square_Error_Batch.mean();
+    # dimension. If the caller already evaluated Sol_NN, we use that instead.
+    if(U is None):
+        U = Sol_NN(Data_Coords);
+    u_approx_batch = U.view(-1);
+
+    # Data_Values (and, if we're autocasting, u_approx_batch) may use a lower
+    # precision data type than float32 (to save memory bandwidth). We compute
+    # the error in the most precise of the two data types and float32.
+    Error_Type : torch.dtype = torch.promote_types(torch.promote_types(u_approx_batch.dtype, Data_Values.dtype), torch.float32);
+    u_approx_batch  = u_approx_batch.to(dtype = Error_Type);
+    u_true_batch    = Data_Values.to(dtype = Error_Type);
+
+    # Compute and return the mean square error. mse_loss does the subtraction,
+    # squaring, and averaging in one fused kernel (rather than launching one
+    # kernel, and allocating one intermediate Tensor, per operation).
+    return torch.nn.functional.mse_loss(u_approx_batch, u_true_batch);
@@ -1,7 +1,7 @@
 import numpy as np;
 import torch;
 
-from typing import Tuple;
+from typing import Tuple, List;
 from Network import Neural_Network;
 
 
@@ -11,8 +11,7 @@ def Evaluate_Derivatives(
         Time_Derivative_Order       : int,
         Spatial_Derivative_Order    : int,
         Coords                      : torch.Tensor,
-        Data_Type                   : torch.dtype = torch.float32,
-        Device                      : torch.device = torch.device('cpu')) -> Tuple[torch.Tensor, torch.Tensor]:
+        U                           : torch.Tensor = None) -> Tuple[torch.Tensor, torch.Tensor]:
     """ This function evaluates U, D_t^m U (where m = Time_Derivative_Order)
     and D_x^i U (for i = 1,2,..., n. Where n = Spatial_Derivative_Order) at each
     coordinate in Coords.
@@ -33,9 +32,10 @@ def Evaluate_Derivatives(
     Coords: A two-column Tensor whose ith row holds the t, x coordinates of the
     ith point we'll evaluate Sol_NN and its derivatives at.
 
-    Data_Type: The data type that all Tensors in Sol_NN use.
-
-    Device: The device that Sol_NN is loaded on.
+    U: If this is not None, then it should hold Sol_NN evaluated at Coords (for
+    example, a slice of the output of Fused_Forward). In this case, we use U
+    instead of evaluating Sol_NN at Coords. Note that Coords must have required
+    grad when U was computed.
 
     ----------------------------------------------------------------------------
     Returns:
@@ -50,21 +50,22 @@ def Evaluate_Derivatives(
     # We need to evaluate derivatives, so set Requires Grad to true.
     Coords.requires_grad_(True);
 
-    # Determine how many derivatives of Sol_NN we'll need to evaluate the PDE.
     # Remember that PDE_NN is a function of u, D_x U, D_x^2 U, ... D_x^{n}U,
-    # where n = Spatial_Derivative_Order.
-    # Once we know this, and the number of Collocation points, we initialize a
-    # Tensor to hold the value of Sol_NN and its first n-1 derivatives at each
-    # collocation point. The ith row of this Tensor holds the value of Sol_NN
-    # and its first n-1 derivatives at the ith collocation point. Its jth column
-    # holds the jth spatial derivative of Sol_NN at each collocation point.
-    num_Collocation_Points : int = Coords.shape[0];
-    Dxn_U                        = torch.empty((num_Collocation_Points, Spatial_Derivative_Order + 1),
-                                                dtype  = Data_Type,
-                                                device = Device);
-
-    # Calculate approximate solution at this collocation point.
-    Dxn_U[:, 0]                  = Sol_NN(Coords).view(-1);
+    # where n = Spatial_Derivative_Order. We store the value of Sol_NN and its
+    # first n spatial derivatives in a list, whose jth element holds the jth
+    # spatial derivative of Sol_NN at each collocation point. Once we have all
+    # of them, we stack them into the columns of Dxn_U. We do this (rather
+    # than writing each derivative into a column of a preallocated Tensor)
+    # because every in-place column write adds a node to the computational
+    # graph that copies the entire Tensor during back-propagation. Those copies
+    # add up, since we back-propagate through Dxn_U several times.
+    Dxn_U_List : List[torch.Tensor] = [];
+
+    # Calculate approximate solution at this collocation point (unless the
+    # caller already did).
+    if(U is None):
+        U = Sol_NN(Coords);
+    Dxn_U_List.append(U.view(-1));
 
     # Compute the derivative of Sol_NN with respect to t, x at each collocation
     # point. To speed up computations, we batch this computation. It's
@@ -90,9 +91,9 @@ def Evaluate_Derivatives(
     # result is a 2 column Tensor. whose (i, 0) entry holds (d/dt_i)u(t_i, x_i),
     # and whose (i, 1) entry holds (d/dx_i)u(t_i, x_i).
     Grad_U = torch.autograd.grad(
-                outputs         = Dxn_U[:, 0],
+                outputs         = Dxn_U_List[0],
                 inputs          = Coords,
-                grad_outputs    = torch.ones_like(Dxn_U[:, 0]),
+                grad_outputs    = torch.ones_like(Dxn_U_List[0]),
                 retain_graph    = True,
                 create_graph    = True)[0];
     # So... why do we do this rather than computing the derivatives
@@ -101,7 +102,7 @@ def Evaluate_Derivatives(
 
     # extract du/dx and du/dt (at each collocation point) from Grad_U.
     Dtm_U : torch.Tensor    = Grad_U[:, 0].view(-1);
-    Dxn_U[:, 1]             = Grad_U[:, 1];
+    Dxn_U_List.append(Grad_U[:, 1]);
 
 
 
@@ -135,14 +136,17 @@ def Evaluate_Derivatives(
         # function (which it will use in backpropagation). We also need to
         # retain grad_u's graph for backpropagation.
         Grad_Dxn_U = torch.autograd.grad(
-                        outputs         = Dxn_U[:, j - 1],
+                        outputs         = Dxn_U_List[j - 1],
                         inputs          = Coords,
-                        grad_outputs    = torch.ones_like(Dxn_U[:, j - 1]),
+                        grad_outputs    = torch.ones_like(Dxn_U_List[j - 1]),
                         retain_graph    = True,
                         create_graph    = True)[0];
 
         # Extract D_x^i U, which is the 1 column of the above Tensor.
-        Dxn_U[:, j] = Grad_Dxn_U[:, 1];
+        Dxn_U_List.append(Grad_Dxn_U[:, 1]);
+
+    # Stack the spatial derivatives into the columns of Dxn_U.
+    Dxn_U : torch.Tensor = torch.stack(Dxn_U_List, dim = 1);
 
     return (Dtm_U, Dxn_U);
 
@@ -154,8 +158,7 @@ def PDE_Residual(
         Time_Derivative_Order       : int,
         Spatial_Derivative_Order    : int,
         Coords                      : torch.Tensor,
-        Data_Type                   : torch.dtype = torch.float32,
-        Device                      : torch.device = torch.device('cpu')) -> torch.Tensor:
+        U                           : torch.Tensor = None) -> torch.Tensor:
     """ This function evaluates the "PDE residual" at each coordinate in Coords.
     For brevtiy, let u = Sol_NN, and N = PDE_NN. At each coordinate, we compute
                         D_t^m U - N(u, D_x U, D_x^2 U, ... D_x^n U)
@@ -179,9 +182,8 @@ def PDE_Residual(
     Coords: A two-column Tensor whose ith row holds the t, x coordinates of the
     ith point where we evaluate the PDE residual.
 
-    Data_Type: The data type that all tensors in Sol_NN and PDE_NN use.
-
-    Device: The device that Sol_NN and PDE_NN are loaded on.
+    U: If this is not None, then it should hold Sol_NN evaluated at Coords. See
+    Evaluate_Derivatives.
 
     ----------------------------------------------------------------------------
     Returns:
@@ -201,8 +203,7 @@ def PDE_Residual(
                         Time_Derivative_Order       = Time_Derivative_Order,
                         Spatial_Derivative_Order    = Spatial_Derivative_Order,
                         Coords                      = Coords,
-                        Data_Type                   = Data_Type,
-                        Device                      = Device);
+                        U                           = U);
 
     # Evaluate PDE_NN at each row of diu_dxi. This yields an N by 1 Tensor
     # (where N is the number of rows in Coords) whose ith row holds the value of
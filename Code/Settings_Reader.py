@@ -306,6 +306,12 @@ def Settings_Reader() -> Settings_Container:
     else:
         raise Read_Error("\"Train on CPU or GPU\" should be \"CPU\" or \"GPU\". Got " + Buffer);
 
+    # Should we use mixed (bfloat16) precision when training on a GPU?
+    Settings.Mixed_Precision = Read_Bool_Setting(File, "Mixed Precision [bool] :");
+
+    # Should we capture the training loss in a CUDA graph?
+    Settings.CUDA_Graphs     = Read_Bool_Setting(File, "CUDA Graphs [bool] :");
+
 
 
     ############################################################################
@@ -354,6 +360,14 @@ def Settings_Reader() -> Settings_Container:
         raise Read_Error("\"PDE Network - Activation Function [str] :\" should be one of" + \
                          "\"Tanh\", \"Sin\", or \"Rational\" Got " + Buffer);
 
+    # Should we compile PDE_NN (with torch.compile)?
+    Settings.PDE_Compile             = Read_Bool_Setting(File, "PDE Network - Compile [bool] :");
+
+    # A compiled PDE_NN uses its own CUDA graphs, which can't be captured in
+    # ours. Thus, we can't do both.
+    if(Settings.PDE_Compile == True and Settings.CUDA_Graphs == True):
+        raise Read_Error("\"PDE Network - Compile\" and \"CUDA Graphs\" can not both be True.");
+
     # Read optimizer.
     Buffer = Read_Setting(File, "Optimizer [Adam, LBFGS, SGD] :");
     if  (Buffer[0] == 'A' or Buffer[0] == 'a'):
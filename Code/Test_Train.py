@@ -1,9 +1,219 @@
 import numpy as np;
 import torch;
-from typing import Tuple;
+import warnings;
+from typing import Tuple, List;
 
 from Network import Neural_Network;
-from Loss_Functions import Data_Loss, Collocation_Loss;
+from Loss_Functions import Data_Loss, Collocation_Loss, Fused_Forward;
+
+
+
+def To_Device(
+        X           : torch.Tensor,
+        Data_Type   : torch.dtype,
+        Device      : torch.device) -> torch.Tensor:
+    """ This function moves X to Device and casts it to Data_Type. If X is
+    already on Device and uses Data_Type, then this just returns X (no copy).
+    If X lives in CPU memory and Device is a GPU, then we pin X first so that
+    the copy can happen asynchronously.
+
+    ----------------------------------------------------------------------------
+    Arguments:
+
+    X: The tensor we want to move.
+
+    Data_Type: The data type we want X to use.
+
+    Device: The device we want X to live on.
+
+    ----------------------------------------------------------------------------
+    Returns:
+
+    A tensor on Device, which uses Data_Type, and holds the values in X. """
+
+    if(X.device.type == 'cpu' and Device.type == 'cuda'):
+        X = X.pin_memory();
+
+    return X.to(device = Device, dtype = Data_Type, non_blocking = True);
+
+
+
+class Graph_Container:
+    # A container for a captured CUDA graph and the static Tensors it reads
+    # from (the coordinates and data) and writes to (the loss and the
+    # gradients).
+    pass;
+
+
+
+def Capture_Graph(
+        Evaluate_Loss,
+        Params                      : List[torch.Tensor],
+        Collocation_Coords          : torch.Tensor,
+        Data_Coords                 : torch.Tensor,
+        Data_Values                 : torch.Tensor,
+        Num_Warmup_Iters            : int = 3) -> Graph_Container:
+    """ This function captures a CUDA graph of the loss evaluation and its
+    backward pass. Replaying the graph re-runs every kernel that the loss
+    evaluation and back-propagation launched, without any Python or dispatcher
+    overhead. This helps a lot when the networks are small (in which case
+    most of the time goes to launching kernels).
+
+    A graph always reads from, and writes to, the same memory. Thus, we make
+    static copies of the coordinates and data; to evaluate the loss at new
+    coordinates, copy them into the returned container's Collocation_Coords
+    (and so on) and then replay the graph. Replaying the graph writes the loss
+    to the container's Loss Tensor and the gradients to the container's Grads
+    Tensors. The parameter update is not part of the graph, so the optimizer
+    can update the parameters (in place) between replays. Each capture points
+    the parameters' grad attributes at a new set of gradient Tensors. Thus,
+    before replaying a graph, point each parameter's grad attribute back at the
+    corresponding Tensor in that graph's Grads list.
+
+    ----------------------------------------------------------------------------
+    Arguments:
+
+    Evaluate_Loss: A function which accepts Collocation_Coords, Data_Coords, and
+    Data_Values (as keyword arguments) and returns the loss (a scalar Tensor).
+
+    Params: The parameters that the optimizer trains. We only back-propagate
+    to these (see Discovery_Training).
+
+    Collocation_Coords, Data_Coords, Data_Values: Tensors whose shape, data
+    type, and device we use for the graph's static inputs. See
+    Discovery_Training.
+
+    Num_Warmup_Iters: The number of times we evaluate the loss (on a side
+    stream) before capturing the graph.
+
+    ----------------------------------------------------------------------------
+    Returns:
+
+    A Graph_Container object. Its Graph attribute holds the graph, while its
+    Collocation_Coords, Data_Coords, Data_Values, Loss, and Grads attributes
+    hold the graph's static inputs and outputs (Grads[i] holds the gradient of
+    Params[i]). """
+
+    Container = Graph_Container();
+
+    # Set up the static inputs. We need to differentiate with respect to the
+    # collocation coordinates, so that Tensor needs to require grad.
+    Container.Collocation_Coords    = Collocation_Coords.detach().clone().requires_grad_(True);
+    Container.Data_Coords           = Data_Coords.detach().clone();
+    Container.Data_Values           = Data_Values.detach().clone();
+
+    # Warm up on a side stream. This makes sure that everything that gets
+    # lazily initialized (cuBLAS handles, cuDNN algorithm selection, etc.)
+    # happens before the capture.
+    Side_Stream = torch.cuda.Stream();
+    Side_Stream.wait_stream(torch.cuda.current_stream());
+    with torch.cuda.stream(Side_Stream):
+        for i in range(Num_Warmup_Iters):
+            for Param in Params:
+                Param.grad = None;
+            Loss = Evaluate_Loss(
+                        Collocation_Coords  = Container.Collocation_Coords,
+                        Data_Coords         = Container.Data_Coords,
+                        Data_Values         = Container.Data_Values);
+            Loss.backward(inputs = Params);
+    torch.cuda.current_stream().wait_stream(Side_Stream);
+
+    # Capture the graph. We set the gradients to None first so that backward
+    # allocates them from the graph's memory pool (replays will then write
+    # the gradients to the same place).
+    for Param in Params:
+        Param.grad = None;
+    Container.Graph = torch.cuda.CUDAGraph();
+    with torch.cuda.graph(Container.Graph):
+        Container.Loss = Evaluate_Loss(
+                            Collocation_Coords  = Container.Collocation_Coords,
+                            Data_Coords         = Container.Data_Coords,
+                            Data_Values         = Container.Data_Values);
+        Container.Loss.backward(inputs = Params);
+
+    # Keep track of the gradient Tensors that the graph writes to.
+    Container.Grads = [Param.grad for Param in Params];
+
+    return Container;
+
+
+
+def Shard(
+        X           : torch.Tensor,
+        Rank        : int,
+        World_Size  : int) -> Tuple[torch.Tensor, float]:
+    """ This function splits X's rows into World_Size shards (whose sizes
+    differ by at most one) and returns the one that belongs to Rank, along
+    with the fraction of X's rows that are in that shard.
+
+    ----------------------------------------------------------------------------
+    Arguments:
+
+    X: The tensor we want to split.
+
+    Rank: The rank of the process whose shard we want.
+
+    World_Size: The number of processes.
+
+    ----------------------------------------------------------------------------
+    Returns:
+
+    A two element tuple. The first element holds Rank's shard of X (a view of
+    X), while the second holds the fraction of X's rows in that shard. """
+
+    X_Shard : torch.Tensor = torch.tensor_split(X, World_Size, dim = 0)[Rank];
+    return (X_Shard, X_Shard.shape[0]/X.shape[0]);
+
+
+
+def Sum_Across_Ranks(
+        Loss        : torch.Tensor,
+        Params      : List[torch.Tensor]) -> torch.Tensor:
+    """ This function sums the loss, and the gradients of the parameters in
+    Params, across every process in the default process group. Each process
+    should weight its loss by the fraction of the points it holds (see
+    Discovery_Training). In this case, the sum is the loss (and the gradient)
+    over all of the points.
+
+    We do this by hand, rather than by wrapping the networks in
+    DistributedDataParallel, because DDP only syncs gradients that autograd
+    accumulates into the parameters' grad attributes during a single
+    backward pass per forward pass. Our loss takes derivatives of Sol_NN with
+    respect to its inputs (using torch.autograd.grad) before we call backward,
+    which DDP does not support.
+
+    ----------------------------------------------------------------------------
+    Arguments:
+
+    Loss: This process's (weighted) loss (a scalar Tensor).
+
+    Params: The parameters that the optimizer trains (the parameters of Sol_NN
+    and PDE_NN). We sum their gradients.
+
+    ----------------------------------------------------------------------------
+    Returns:
+
+    The sum of the processes' losses (a detached scalar Tensor). After this
+    function returns, each parameter's grad attribute holds the sum of the
+    processes' gradients. """
+
+    # Gather the gradients. We flatten them into one Tensor (along with the
+    # loss) so that we only need one all-reduce.
+    Grads : List[torch.Tensor] = [Param.grad for Param in Params if Param.grad is not None];
+
+    Flat = torch.cat([Loss.detach().view(1)] + [Grad.view(-1) for Grad in Grads]);
+
+    # Sum across the processes.
+    torch.distributed.all_reduce(Flat, op = torch.distributed.ReduceOp.SUM);
+
+    # Copy the summed gradients back.
+    Index : int = 1;
+    for Grad in Grads:
+        Num_Elements : int = Grad.numel();
+        Grad.copy_(Flat[Index:(Index + Num_Elements)].view_as(Grad));
+        Index += Num_Elements;
+
+    return Flat[0];
 
 
 
@@ -17,7 +227,12 @@ def Discovery_Training(
         Data_Values                 : torch.Tensor,
         Optimizer                   : torch.optim.Optimizer,
         Data_Type                   : torch.dtype = torch.float32,
-        Device                      : torch.device = torch.device('cpu')) -> None:
+        Device                      : torch.device = torch.device('cpu'),
+        Mixed_Precision             : bool = False,
+        CUDA_Graphs                 : bool = False,
+        Graph_Cache                 : dict = None,
+        Rank                        : int  = 0,
+        World_Size                  : int  = 1) -> None:
     """ This function runs one epoch of training when in "Discovery" mode. In
     this mode, we enforce the leaned PDE at the Collocation_Points and the
     Data_Values at the Data_Points.
@@ -54,56 +269,295 @@ def Discovery_Training(
     data point.
 
     optimizer: the optimizer we use to train Sol_NN and PDE_NN. It should have
-    been initialized with both network's parameters.
+    been initialized with both network's parameters. If this is an LBFGS
+    optimizer, then it should use a line search (line_search_fn =
+    "strong_wolfe"); a short history (history_size = 10) also works well for
+    our loss. Without the line search, LBFGS usually needs many more closure
+    evaluations (forward and backward passes) per step.
 
     Data_Type: The data type of all tensors in Sol_NN, PDE_NN.
 
     Device: The device for Sol_NN and PDE_NN.
 
+    Mixed_Precision: If True (and Device is a GPU), we evaluate the loss using
+    bfloat16 autocasting. The network parameters (and their gradients) remain
+    in Data_Type.
+
+    CUDA_Graphs: If True (and Device is a GPU), we capture the loss evaluation
+    (and its backward pass) in a CUDA graph, and each closure call just
+    replays the graph. Note that this means the gradients of Sol_NN and
+    PDE_NN's parameters are overwritten (rather than reset) by each closure
+    call. See Capture_Graph.
+
+    Graph_Cache: A dictionary in which we store the captured CUDA graphs (one
+    per combination of coordinate shapes, Data_Values data type, and so on),
+    so that later calls can reuse them.
+    The graphs belong to Sol_NN, PDE_NN, and Optimizer. Thus, the caller should
+    make a new (empty) dictionary for each set of networks and optimizer, and
+    pass the same one to every call that uses them. If this is None, then we
+    capture a new graph every call. We ignore this if we're not using CUDA
+    graphs.
+
+    Rank, World_Size: If World_Size > 1, then we're one of World_Size processes
+    (the one whose rank is Rank) that train Sol_NN and PDE_NN together. In this
+    case, each process evaluates the loss on its share of the collocation and
+    data points, and the processes combine their losses and gradients (see
+    Sum_Across_Ranks). After the step, every process gets a copy of rank 0's
+    network buffers. The caller must set up the process group, and make sure
+    that every process starts with the same network parameters. Every
+    process needs at least one collocation point and one data point.
+
     ----------------------------------------------------------------------------
     Returns:
 
     Nothing! """
 
+    # LBFGS without a line search usually needs many more loss evaluations
+    # (each of which is a forward and backward pass) per step. Warn the user if
+    # that's what they're using (for example, if they loaded an old LBFGS
+    # state).
+    if(isinstance(Optimizer, torch.optim.LBFGS) and Optimizer.param_groups[0].get('line_search_fn') is None):
+        warnings.warn("LBFGS is not using a line search. Set line_search_fn = \"strong_wolfe\" for fewer closure evaluations per step.");
+
     # Put the networks in training mode.
     Sol_NN.train();
     PDE_NN.train();
 
+    # Make sure the networks live on Device and use Data_Type. The loss
+    # functions don't cast anything; they assume that the networks and the
+    # coordinates they're passed already agree. If the networks already use
+    # Device and Data_Type, this does nothing.
+    Sol_NN.to(device = Device, dtype = Data_Type);
+    PDE_NN.to(device = Device, dtype = Data_Type);
+
+    # If we're on a GPU, let cuBLAS/cuDNN use TF32 tensor cores for float32
+    # matrix multiplications and convolutions, and let cuDNN pick its fastest
+    # algorithms. TF32 keeps float32's range but has a 10 bit mantissa, which
+    # is plenty for the loss. This matters when we aren't autocasting to
+    # bfloat16 (in which case the matrix multiplications run in float32).
+    # Setting the float32 matmul precision to "high" is the current way to
+    # enable TF32 matrix multiplications.
+    if(Device.type == 'cuda'):
+        torch.set_float32_matmul_precision('high');
+        torch.backends.cudnn.allow_tf32         = True;
+        torch.backends.cudnn.benchmark          = True;
+
+    # Autocasting and CUDA graphs only make sense on GPUs, so we ignore
+    # Mixed_Precision and CUDA_Graphs on a CPU.
+    Use_Autocast : bool = (Mixed_Precision == True and Device.type == 'cuda');
+    Use_Graph    : bool = (CUDA_Graphs     == True and Device.type == 'cuda');
+
+    # Move the coordinates, data to Device (if they're not there already). We
+    # do this once, here, so that every call to the closure (LBFGS calls it
+    # several times per step) works with tensors that already live on Device.
+    # If we're using mixed precision, then we store Data_Values in bfloat16.
+    # We never differentiate with respect to Data_Values, so this just halves
+    # the memory traffic it generates (Data_Loss casts it back up before
+    # computing the error).
+    Values_Type : torch.dtype = (torch.bfloat16 if Use_Autocast == True else Data_Type);
+    Collocation_Coords  = To_Device(Collocation_Coords, Data_Type,   Device);
+    Data_Coords         = To_Device(Data_Coords,        Data_Type,   Device);
+    Data_Values         = To_Device(Data_Values,        Values_Type, Device);
+
+    # If we're training on several processes, then each one only gets its
+    # share of the collocation and data points. tensor_split (unlike chunk)
+    # always returns World_Size shards, whose sizes differ by at most one.
+    # Since the shards can have different sizes, each process weights its
+    # collocation and data losses by the fraction of the collocation and data
+    # points it holds. Summing the weighted losses (and their gradients)
+    # across the processes then gives the loss (and gradient) over all of the
+    # points. The one exception is batch normalization: if PDE_NN normalizes
+    # its inputs, then each process uses the batch statistics of its own
+    # shard, so the summed loss only approximates the full batch loss.
+    Coll_Weight : float = 1.0;
+    Data_Weight : float = 1.0;
+    if(World_Size > 1):
+        (Collocation_Coords, Coll_Weight) = Shard(Collocation_Coords, Rank, World_Size);
+        (Data_Coords,        Data_Weight) = Shard(Data_Coords,        Rank, World_Size);
+        Data_Values                       = Shard(Data_Values,        Rank, World_Size)[0];
+
+    # We differentiate Sol_NN with respect to the collocation coordinates. Since
+    # we evaluate Sol_NN at the collocation and data points in one batch (see
+    # below), Collocation_Coords must require grad before that evaluation.
+    Collocation_Coords.requires_grad_(True);
+
+    # If we're on a GPU, then we evaluate the collocation loss on a separate
+    # CUDA stream, so that it can run concurrently with the data loss (which
+    # we evaluate on the current stream). The data loss is just one mse_loss
+    # (Sol_NN's forward pass happens before we split off; see below), so it
+    # doesn't need a stream of its own. We only create one stream per GPU;
+    # after that, we store it (in a dictionary keyed by the GPU) as an
+    # attribute of this function. On a CPU, the stream is None, in which case
+    # torch.cuda.stream does nothing.
+    Coll_Stream = None;
+    if(Device.type == 'cuda'):
+        # If Device doesn't specify an index, it means the current GPU.
+        Stream_Device : torch.device = Device;
+        if(Stream_Device.index is None):
+            Stream_Device = torch.device('cuda', torch.cuda.current_device());
+
+        if(hasattr(Discovery_Training, "Coll_Streams") == False):
+            Discovery_Training.Coll_Streams = {};
+        if(Stream_Device not in Discovery_Training.Coll_Streams):
+            Discovery_Training.Coll_Streams[Stream_Device] = torch.cuda.Stream(device = Stream_Device);
+        Coll_Stream = Discovery_Training.Coll_Streams[Stream_Device];
+
+    # If we capture the loss in a CUDA graph, then we need to disable the
+    # autocast cache (cached casts can't be reused across graph replays).
+    Autocast_Cache : bool = (Use_Graph == False);
+
+    # This function evaluates the loss at the passed coordinates and data.
+    def Evaluate_Loss(
+            Collocation_Coords  : torch.Tensor,
+            Data_Coords         : torch.Tensor,
+            Data_Values         : torch.Tensor) -> torch.Tensor:
+        # Evaluate Sol_NN at the collocation and data points in a single
+        # forward pass (rather than one pass per loss). We do this on the
+        # current stream. If we're using mixed precision, then the network
+        # evaluations run in bfloat16. Since bfloat16 has the same exponent
+        # range as float32, we don't need to scale the loss. Note that we only
+        # autocast the forward pass.
+        with torch.autocast(device_type = Device.type, dtype = torch.bfloat16, enabled = Use_Autocast, cache_enabled = Autocast_Cache):
+            (U_Coll, U_Data) = Fused_Forward(
+                                    Sol_NN      = Sol_NN,
+                                    Coords_List = [Collocation_Coords, Data_Coords]);
+
+        # The collocation stream must wait for the work already queued on the
+        # current stream (in particular, the last parameter update and the
+        # forward pass above).
+        if(Device.type == 'cuda'):
+            Main_Stream = torch.cuda.current_stream(Device);
+            Coll_Stream.wait_stream(Main_Stream);
+
+        # Evaluate the Loss (Note, we enforce a BC of 0).
+        with torch.cuda.stream(Coll_Stream), torch.autocast(device_type = Device.type, dtype = torch.bfloat16, enabled = Use_Autocast, cache_enabled = Autocast_Cache):
+            Coll_Loss : torch.Tensor = Collocation_Loss(
+                                            Sol_NN                      = Sol_NN,
+                                            PDE_NN                      = PDE_NN,
+                                            Time_Derivative_Order       = Time_Derivative_Order,
+                                            Spatial_Derivative_Order    = Spatial_Derivative_Order,
+                                            Collocation_Coords          = Collocation_Coords,
+                                            U                           = U_Coll);
+
+        with torch.autocast(device_type = Device.type, dtype = torch.bfloat16, enabled = Use_Autocast, cache_enabled = Autocast_Cache):
+            Data_loss : torch.Tensor = Data_Loss(
+                                            Sol_NN      = Sol_NN,
+                                            Data_Coords = Data_Coords,
+                                            Data_Values = Data_Values,
+                                            U           = U_Data);
+
+        # Make the current stream wait for the collocation loss before we use
+        # it. We also tell the allocator that the collocation loss is used on
+        # the current stream (so it doesn't recycle its memory too early).
+        # Autograd runs each backward op on the stream of the corresponding
+        # forward op, so the backward pass is also split across the two
+        # streams. During graph capture, all memory comes from the graph's
+        # private pool (which is never recycled), so we skip record_stream.
+        if(Device.type == 'cuda'):
+            Main_Stream.wait_stream(Coll_Stream);
+            if(torch.cuda.is_current_stream_capturing() == False):
+                Coll_Loss.record_stream(Main_Stream);
+
+        # If we're training on several processes, then weight the losses by
+        # this process's share of the points (see above).
+        if(World_Size > 1):
+            Coll_Loss = Coll_Weight*Coll_Loss;
+            Data_loss = Data_Weight*Data_loss;
+
+        # Sum the losses. We stack them and then reduce, which adds a single
+        # node to the computational graph (rather than one per "+").
+        return torch.stack([Coll_Loss, Data_loss]).sum();
+
+    # Fetch the parameters that Optimizer trains. These don't change between
+    # closure calls, so we do this once, here. When we back-propagate, we only
+    # ask for the gradient with respect to these parameters. Otherwise, autograd
+    # would also compute (and accumulate) the gradient of the loss with respect
+    # to Collocation_Coords, which requires grad (so that we can differentiate
+    # Sol_NN with respect to it) but which we never use.
+    Params : List[torch.Tensor] = [Param for Param_Group in Optimizer.param_groups for Param in Param_Group['params']];
+
+    # If we're using a CUDA graph, then fetch it from Graph_Cache (or capture
+    # it, if this is the first time we've seen this combination of coordinate
+    # shapes, Data_Values data type, autocasting, and loss weights; the graph
+    # bakes in all of these), and then copy this epoch's coordinates and data
+    # into the graph's static input tensors.
+    if(Use_Graph == True):
+        if(Graph_Cache is None):
+            Graph_Cache = {};
+
+        Key = ( tuple(Collocation_Coords.shape), tuple(Data_Coords.shape),
+                Data_Values.dtype, Use_Autocast, Coll_Weight, Data_Weight);
+        if(Key not in Graph_Cache):
+            Graph_Cache[Key] = Capture_Graph(
+                                    Evaluate_Loss       = Evaluate_Loss,
+                                    Params              = Params,
+                                    Collocation_Coords  = Collocation_Coords,
+                                    Data_Coords         = Data_Coords,
+                                    Data_Values         = Data_Values);
+        Graph = Graph_Cache[Key];
+
+        with torch.no_grad():
+            Graph.Collocation_Coords.copy_(Collocation_Coords);
+            Graph.Data_Coords.copy_(Data_Coords);
+            Graph.Data_Values.copy_(Data_Values);
+
     # Define closure function (needed for LBFGS)
     def Discovery_Closure():
-        # Zero out the gradients (if they are enabled).
-        if (torch.is_grad_enabled()):
-            Optimizer.zero_grad();
-
-        # Evaluate the Loss (Note, we enforce a BC of 0)
-        Loss = (Collocation_Loss(
-                    Sol_NN                      = Sol_NN,
-                    PDE_NN                      = PDE_NN,
-                    Time_Derivative_Order       = Time_Derivative_Order,
-                    Spatial_Derivative_Order    = Spatial_Derivative_Order,
-                    Collocation_Coords          = Collocation_Coords,
-                    Data_Type                   = Data_Type,
-                    Device                      = Device)
-
-                +
-
-                Data_Loss(
-                    Sol_NN = Sol_NN,
-                    Data_Coords = Data_Coords,
-                    Data_Values = Data_Values,
-                    Data_Type = Data_Type,
-                    Device    = Device));
-
-        # Back-propigate to compute gradients of Loss with respect to network
-        # parameters (only do if this if the loss requires grad)
-        if (Loss.requires_grad == True):
-            Loss.backward();
+        if(Use_Graph == True):
+            # If we captured the loss in a CUDA graph, then just replay it.
+            # This overwrites Graph.Loss and Graph.Grads. Note that we must not
+            # reset the gradients here; the graph writes to the gradient
+            # tensors that existed when we captured it. Capturing another graph
+            # (for other coordinate shapes) points the parameters' grad
+            # attributes elsewhere, so we point them back at this graph's
+            # gradient tensors first.
+            for (Param, Grad) in zip(Params, Graph.Grads):
+                Param.grad = Grad;
+            Graph.Graph.replay();
+            Loss = Graph.Loss;
+
+        else:
+            # Reset the gradients (if they are enabled). Setting them to None
+            # (rather than filling them with zeros) avoids writing to every
+            # gradient tensor; backward will allocate them again.
+            if (torch.is_grad_enabled()):
+                Optimizer.zero_grad(set_to_none = True);
+
+            # Evaluate the loss.
+            Loss = Evaluate_Loss(
+                        Collocation_Coords  = Collocation_Coords,
+                        Data_Coords         = Data_Coords,
+                        Data_Values         = Data_Values);
+
+            # Back-propigate to compute gradients of Loss with respect to
+            # network parameters (only do if this if the loss requires grad)
+            if (Loss.requires_grad == True):
+                Loss.backward(inputs = Params);
+
+        # If we're training on several processes, then each one only computed
+        # the (weighted) loss, and its gradients, on its shard of the points.
+        # Sum them across the processes so that every process gets the loss
+        # over all of the points (and thus takes the same step).
+        if(World_Size > 1):
+            Loss = Sum_Across_Ranks(
+                        Loss        = Loss,
+                        Params      = Params);
 
         return Loss;
 
     # update network parameters.
     Optimizer.step(Discovery_Closure);
 
+    # If we're training on several processes, then each one updated its
+    # networks' buffers (for example, the running statistics of PDE_NN's batch
+    # norm layer, if it has one) using its own shard of the points. Copy rank
+    # 0's buffers to the other processes so that the networks stay the same
+    # on every process.
+    if(World_Size > 1):
+        for Network in (Sol_NN, PDE_NN):
+            for Buffer in Network.buffers():
+                torch.distributed.broadcast(Buffer, src = 0);
+
 
 
 def Discovery_Testing(
@@ -116,10 +570,13 @@ def Discovery_Testing(
         Data_Values                 : torch.Tensor,
         Data_Type                   : torch.dtype = torch.float32,
         Device                      : torch.device = torch.device('cpu')) -> Tuple[float, float]:
-    """ This function runs testing when in "Discovery" mode. You CAN NOT run this
-    function with no_grad set True. Why? Because we need to evaluate derivatives
-    of the solution with respect to the inputs! Thus, we need torch to build a
-    computational graph.
+    """ This function runs testing when in "Discovery" mode. The collocation
+    loss needs derivatives of the solution with respect to the inputs, so we
+    evaluate it with grad enabled (even if the caller disabled it). We don't
+    need gradients with respect to the network parameters, though. Thus, while
+    we evaluate the losses, we temporarily set requires_grad = False for every
+    parameter of Sol_NN and PDE_NN. We restore their requires_grad flags before
+    returning (even if evaluating the losses raises an exception).
 
     Note: This function works regardless of how many spatial variables Sol_NN
     depends on so long as Collocation_Loss does too.
@@ -166,22 +623,50 @@ def Discovery_Testing(
     Sol_NN.eval();
     PDE_NN.eval();
 
-    # Get the losses at the passed collocation points (Note we enforce a 0 BC)
-    Coll_Loss : float = Collocation_Loss(
-                            Sol_NN                      = Sol_NN,
-                            PDE_NN                      = PDE_NN,
-                            Time_Derivative_Order       = Time_Derivative_Order,
-                            Spatial_Derivative_Order    = Spatial_Derivative_Order,
-                            Collocation_Coords          = Collocation_Coords,
-                            Data_Type                   = Data_Type,
-                            Device                      = Device).item();
-
-    Data_loss : float  = Data_Loss(
-                            Sol_NN      = Sol_NN,
-                            Data_Coords = Data_Coords,
-                            Data_Values = Data_Values,
-                            Data_Type   = Data_Type,
-                            Device      = Device).item();
+    # Move the coordinates, data to Device (if they're not there already).
+    Collocation_Coords  = To_Device(Collocation_Coords, Data_Type, Device);
+    Data_Coords         = To_Device(Data_Coords,        Data_Type, Device);
+    Data_Values         = To_Device(Data_Values,        Data_Type, Device);
+
+    # We don't need gradients with respect to the network parameters while
+    # testing, so we temporarily turn them off. This way, autograd only tracks
+    # what it needs to differentiate Sol_NN with respect to its inputs.
+    Params          : list = list(Sol_NN.parameters()) + list(PDE_NN.parameters());
+    Requires_Grad   : list = [Param.requires_grad for Param in Params];
+    for Param in Params:
+        Param.requires_grad_(False);
+
+    # We restore the flags in a finally block so that the networks don't stay
+    # frozen if evaluating the losses raises an exception (or the user hits
+    # Ctrl+C).
+    try:
+        # Get the losses at the passed collocation points (Note we enforce a 0
+        # BC). The collocation loss needs derivatives with respect to the
+        # coordinates, so we explicitly enable grad.
+        with torch.enable_grad():
+            Coll_Loss : torch.Tensor = Collocation_Loss(
+                                           Sol_NN                      = Sol_NN,
+                                           PDE_NN                      = PDE_NN,
+                                           Time_Derivative_Order       = Time_Derivative_Order,
+                                           Spatial_Derivative_Order    = Spatial_Derivative_Order,
+                                           Collocation_Coords          = Collocation_Coords);
+
+        # The data loss needs no derivatives at all.
+        with torch.no_grad():
+            Data_loss : torch.Tensor = Data_Loss(
+                                           Sol_NN      = Sol_NN,
+                                           Data_Coords = Data_Coords,
+                                           Data_Values = Data_Values);
+
+    finally:
+        # Restore the parameters' requires_grad flags.
+        for (Param, Flag) in zip(Params, Requires_Grad):
+            Param.requires_grad_(Flag);
+
+    # Copy both losses to the CPU at once. Each copy from a GPU forces the CPU
+    # to wait for the GPU, so one copy (rather than one per loss) means one
+    # wait.
+    Losses : list = torch.stack([Coll_Loss.detach(), Data_loss]).cpu().tolist();
 
     # Return the losses.
-    return (Coll_Loss, Data_loss);
+    return (Losses[0], Losses[1]);
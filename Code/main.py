@@ -1,5 +1,6 @@
 import numpy;
 import torch;
+import os;
 
 from Network         import Neural_Network;
 from Test_Train      import Discovery_Testing, Discovery_Training;
@@ -16,9 +17,42 @@ def main():
     # Load settings, print them.
 
     Settings = Settings_Reader();
-    print("Loaded the following settings:");
-    for (setting, value) in Settings.__dict__.items():
-        print(("%-30s = " % setting) + str(value));
+
+    # If we were launched by torchrun (or anything else that sets the
+    # WORLD_SIZE, RANK, and LOCAL_RANK environment variables) with more than
+    # one process, then every process trains the same networks on its share
+    # of the collocation and data points. In this case, only rank 0 prints,
+    # tests, and saves.
+    World_Size : int = int(os.environ.get("WORLD_SIZE", "1"));
+    Rank       : int = int(os.environ.get("RANK",       "0"));
+
+    # Only Discovery mode trains anything, so it's the only mode that can use
+    # several processes. In any other mode, rank 0 does everything on its own
+    # and the other processes just exit.
+    if(Settings.Mode != "Discovery" and World_Size > 1):
+        if(Rank != 0):
+            return;
+        World_Size = 1;
+
+    if(Rank == 0):
+        print("Loaded the following settings:");
+        for (setting, value) in Settings.__dict__.items():
+            print(("%-30s = " % setting) + str(value));
+
+
+
+    ############################################################################
+    # Set up distributed training.
+    # If we're training on several processes and on GPUs, then each process
+    # uses its own GPU.
+
+    if(World_Size > 1):
+        if(Settings.Device.type == 'cuda'):
+            Settings.Device = torch.device('cuda', int(os.environ.get("LOCAL_RANK", "0")));
+            torch.cuda.set_device(Settings.Device);
+            torch.distributed.init_process_group(backend = "nccl");
+        else:
+            torch.distributed.init_process_group(backend = "gloo");
 
 
 
@@ -52,6 +86,16 @@ def main():
                              Activation_Function = Settings.PDE_Activation_Function,
                              Batch_Norm          = Settings.PDE_Normalize_Inputs);
 
+    # If we're in Discovery mode, then compile PDE_NN (if requested). We
+    # compile in place so that PDE_NN's state dict keeps its usual keys. Note
+    # that we can't compile Sol_NN, since the collocation loss needs its second
+    # (and higher) derivatives, and compiled modules don't support double
+    # backward. PDE_NN's backward pass is first order, so it's safe to compile.
+    # "reduce-overhead" uses CUDA graphs (when training on a GPU), which cuts
+    # the launch overhead of PDE_NN's small layers.
+    if(Settings.Mode == "Discovery" and Settings.PDE_Compile == True):
+        PDE_NN.compile(mode = "reduce-overhead", fullgraph = False);
+
     # Setup the optimizer.
     Optimizer = None;
     if(Settings.Mode == "Discovery"):
@@ -66,7 +110,10 @@ def main():
         if  (Settings.Optimizer == "Adam"):
             Optimizer = torch.optim.Adam(   Params, lr = Learning_Rate);
         elif(Settings.Optimizer == "LBFGS"):
-            Optimizer = torch.optim.LBFGS(  Params, lr = Learning_Rate);
+            # A strong Wolfe line search with a short history usually needs
+            # far fewer loss evaluations per step than LBFGS's defaults (no
+            # line search, and a history of 100).
+            Optimizer = torch.optim.LBFGS(  Params, lr = Learning_Rate, history_size = 10, line_search_fn = "strong_wolfe");
         elif(Settings.Optimizer == "SGD"):
             Optimizer = torch.optim.SGD(    Params, lr = Learning_Rate, momentum = 0.9, nesterov = True);
         else:
@@ -97,6 +144,13 @@ def main():
             for param_group in Optimizer.param_groups:
                 param_group['lr'] = Settings.Learning_Rate;
 
+    # If we're training on several processes, then they all need to start with
+    # the same networks. Copy rank 0's parameters (and buffers) to the others.
+    if(World_Size > 1):
+        for Network in (Sol_NN, PDE_NN):
+            for Tensor in list(Network.parameters()) + list(Network.buffers()):
+                torch.distributed.broadcast(Tensor.data, src = 0);
+
 
     ############################################################################
     # Set up Data
@@ -109,7 +163,8 @@ def main():
 
     # Setup is done! Figure out how long it took.
     Setup_Time : float = Setup_Timer.Stop();
-    print("Setup took %fs." % Setup_Time);
+    if(Rank == 0):
+        print("Setup took %fs." % Setup_Time);
 
 
 
@@ -134,13 +189,29 @@ def main():
 
             Loss_Counter : int = 0;
 
+        # If we're using CUDA graphs, then Discovery_Training stores the
+        # graphs it captures here (so that it only captures them once).
+        Graph_Cache : dict = {};
+
         for t in range(Epochs):
-            # generate new Collocation points.
-            Train_Colloc_Points = Generate_Points(
-                    Bounds           = Data_Container.Input_Bounds,
-                    Num_Points       = Settings.Num_Train_Colloc_Points,
-                    Data_Type        = torch.float32,
-                    Device           = Settings.Device);
+            # generate new Collocation points. If we're training on several
+            # processes, then they all need the same points (each one trains
+            # on its share of them). Thus, rank 0 generates the points and
+            # then sends them to the other processes.
+            if(Rank == 0):
+                Train_Colloc_Points = Generate_Points(
+                        Bounds           = Data_Container.Input_Bounds,
+                        Num_Points       = Settings.Num_Train_Colloc_Points,
+                        Data_Type        = torch.float32,
+                        Device           = Settings.Device);
+            else:
+                Train_Colloc_Points = torch.empty(
+                        (Settings.Num_Train_Colloc_Points, Data_Container.Input_Bounds.shape[0]),
+                        dtype            = torch.float32,
+                        device           = Settings.Device);
+
+            if(World_Size > 1):
+                torch.distributed.broadcast(Train_Colloc_Points, src = 0);
 
             # Now train!
             Discovery_Training(
@@ -153,11 +224,18 @@ def main():
                 Data_Values                 = Data_Container.Train_Targets,
                 Optimizer                   = Optimizer,
                 Data_Type                   = torch.float32,
-                Device                      = Settings.Device);
+                Device                      = Settings.Device,
+                Mixed_Precision             = Settings.Mixed_Precision,
+                CUDA_Graphs                 = Settings.CUDA_Graphs,
+                Graph_Cache                 = Graph_Cache,
+                Rank                        = Rank,
+                World_Size                  = World_Size);
 
             # Periodically print loss updates. Otherwise, just print the Epoch #
-            # to indicate that we're still alive.
-            if(t % Settings.Epochs_Between_Prints == 0 or t == Epochs - 1):
+            # to indicate that we're still alive. If we're training on several
+            # processes, then they all have the same networks, so only rank 0
+            # does this.
+            if(Rank == 0 and (t % Settings.Epochs_Between_Prints == 0 or t == Epochs - 1)):
                 # Alias the Loss counter for brevity
                 i : int = Loss_Counter;
 
@@ -199,7 +277,7 @@ def main():
 
                 # Increment the counter.
                 Loss_Counter += 1;
-            else:
+            elif(Rank == 0):
                 print(("Epoch #%-4d | "   % t));
 
     elif(Settings.Mode == "Extraction"):
@@ -255,7 +333,7 @@ def main():
     # Epochs are done. Figure out how long they took!
     Main_Time = Main_Timer.Stop();
 
-    if (Settings.Mode == "Discovery"):
+    if   (Rank == 0 and Settings.Mode == "Discovery"):
         # In this mode, training can take hours. Thus, it's usually more
         # useful to report the time in minutes, seconds.
         Minutes : int   = int(Main_Time) // 60;
@@ -265,7 +343,7 @@ def main():
         if(Epochs > 0):
             print("That's an average of %fs per epoch!" % (Main_Time/Epochs));
 
-    elif(Settings.Mode == "Extraction"):
+    elif (Rank == 0 and Settings.Mode == "Extraction"):
         print("Extraction took %fs." % Main_Time);
 
 
@@ -275,13 +353,19 @@ def main():
     # This only makes sense if we're in Discovery mode since that mode actually
     # trains something.
 
-    if(Settings.Mode == "Discovery" and Settings.Save_To_File == True):
+    # If we're training on several processes, then every process has the same
+    # networks, so only rank 0 saves them.
+    if(Settings.Mode == "Discovery" and Settings.Save_To_File == True and Rank == 0):
         Save_File_Path : str = "../Saves/" + Settings.Save_File_Name;
         torch.save({"Sol_Network_State" : Sol_NN.state_dict(),
                     "PDE_Network_State" : PDE_NN.state_dict(),
                     "Optimizer_State"   : Optimizer.state_dict()},
                     Save_File_Path);
 
+    # Clean up the process group (if we made one).
+    if(World_Size > 1):
+        torch.distributed.destroy_process_group();
+
 
 if __name__ == '__main__':
     main();
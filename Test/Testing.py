@@ -14,11 +14,13 @@ import numpy as np;
 import torch;
 import unittest;
 import random;
+import tempfile;
 
 import Network;
 import Loss_Functions;
 import PDE_Residual;
 import Extraction;
+import Test_Train;
 
 
 
@@ -247,6 +249,92 @@ class Test_Loss_Functions(unittest.TestCase):
         # Check that pediction is "sufficiently close" to actual.
         self.assertLess(abs(Data_Loss_Predict - Data_loss_Actual).item(), Num_Data_Points*Epsilon);
 
+        # When we train with mixed precision, Data_Values (and possibly the
+        # network's output) use bfloat16. Data_Loss should still compute the
+        # error in float32. To check this, we compare against the float32 loss
+        # between the same (rounded) values.
+        U                = u_NN(Data_Coords).detach();
+        U_bfloat16       = U.to(dtype = torch.bfloat16);
+        Values_bfloat16  = Data_Values.to(dtype = torch.bfloat16);
+
+        for U_Test in [U, U_bfloat16]:
+            Data_Loss_Reference = torch.mean((U_Test.view(-1).float() - Values_bfloat16.float())**2);
+
+            Data_Loss_Mixed = Loss_Functions.Data_Loss(
+                                    Sol_NN      = u_NN,
+                                    Data_Coords = Data_Coords,
+                                    Data_Values = Values_bfloat16,
+                                    U           = U_Test);
+
+            self.assertEqual(Data_Loss_Mixed.dtype, torch.float32);
+            self.assertLess(abs(Data_Loss_Mixed - Data_Loss_Reference).item(), Epsilon*Data_Loss_Reference.item());
+
+
+
+    def test_Fused_Forward(self):
+        # Set up a simple solution network, and a PDE network (whose inputs are
+        # u, du/dx, and d^2u/dx^2).
+        Hidden_Neurons : int          = random.randint(1, 100);
+        u_NN : Network.Neural_Network = One_Initialize_Network(Hidden_Neurons);
+        N_NN : Network.Neural_Network = Network.Neural_Network(
+                                            Num_Hidden_Layers = 2,
+                                            Neurons_Per_Layer = 10,
+                                            Input_Dim         = 3,
+                                            Output_Dim        = 1);
+
+        # Make up some random collocation points, data points, and data values.
+        # We differentiate u_NN with respect to the collocation points, so they
+        # need to require grad before we evaluate u_NN at them.
+        Num_Coll_Points : int = random.randint(10, 1000);
+        Num_Data_Points : int = random.randint(10, 1000);
+        Coll_Coords           = torch.rand((Num_Coll_Points, 2), dtype = torch.float32, requires_grad = True);
+        Data_Coords           = torch.rand((Num_Data_Points, 2), dtype = torch.float32);
+        Data_Values           = torch.rand(Num_Data_Points, dtype = torch.float32);
+
+        # Evaluate u_NN at both sets of points in one pass.
+        (U_Coll, U_Data) = Loss_Functions.Fused_Forward(
+                                Sol_NN      = u_NN,
+                                Coords_List = [Coll_Coords, Data_Coords]);
+
+        # Each slice should match u_NN evaluated at the corresponding points.
+        # u_NN's output can be as large as Hidden_Neurons + 1, so we scale
+        # the tolerance accordingly.
+        self.assertEqual(U_Coll.shape, (Num_Coll_Points, 1));
+        self.assertEqual(U_Data.shape, (Num_Data_Points, 1));
+        self.assertLess(torch.max(torch.abs(U_Coll - u_NN(Coll_Coords))).item(), 5*Hidden_Neurons*Epsilon);
+        self.assertLess(torch.max(torch.abs(U_Data - u_NN(Data_Coords))).item(), 5*Hidden_Neurons*Epsilon);
+
+        # The losses we get by passing the slices in should match the ones we
+        # get by letting the loss functions evaluate u_NN themselves. The two
+        # evaluate u_NN using different batches (and thus, possibly, different
+        # matrix multiplication kernels), so we compare them up to a relative
+        # tolerance.
+        Data_Loss_Fused = Loss_Functions.Data_Loss(
+                                Sol_NN      = u_NN,
+                                Data_Coords = Data_Coords,
+                                Data_Values = Data_Values,
+                                U           = U_Data);
+        Data_Loss_Unfused = Loss_Functions.Data_Loss(
+                                Sol_NN      = u_NN,
+                                Data_Coords = Data_Coords,
+                                Data_Values = Data_Values);
+        self.assertLess(abs(Data_Loss_Fused - Data_Loss_Unfused).item(), 100*Epsilon*Data_Loss_Unfused.item());
+
+        Coll_Loss_Fused = Loss_Functions.Collocation_Loss(
+                                Sol_NN                      = u_NN,
+                                PDE_NN                      = N_NN,
+                                Time_Derivative_Order       = 1,
+                                Spatial_Derivative_Order    = 2,
+                                Collocation_Coords          = Coll_Coords,
+                                U                           = U_Coll);
+        Coll_Loss_Unfused = Loss_Functions.Collocation_Loss(
+                                Sol_NN                      = u_NN,
+                                PDE_NN                      = N_NN,
+                                Time_Derivative_Order       = 1,
+                                Spatial_Derivative_Order    = 2,
+                                Collocation_Coords          = Coll_Coords);
+        self.assertLess(abs(Coll_Loss_Fused - Coll_Loss_Unfused).item(), 100*Epsilon*Coll_Loss_Unfused.item());
+
 
 
 class Test_PDE_Residual(unittest.TestCase):
@@ -490,5 +578,75 @@ class Test_Extraction(unittest.TestCase):
 
 
 
+class Test_Test_Train(unittest.TestCase):
+    def test_Sum_Across_Ranks(self):
+        # Set up a simple network.
+        Hidden_Neurons : int          = random.randint(1, 100);
+        u_NN : Network.Neural_Network = One_Initialize_Network(Hidden_Neurons);
+        Params : list                 = list(u_NN.parameters());
+
+        # Make up some random data points, values. We pick the number of points
+        # and processes so that the shards usually have different sizes.
+        Num_Data_Points : int = random.randint(10, 1000);
+        World_Size      : int = random.randint(2, 8);
+        Data_Coords           = torch.rand((Num_Data_Points, 2), dtype = torch.float32);
+        Data_Values           = torch.rand(Num_Data_Points, dtype = torch.float32);
+
+        # First, compute the data loss (and its gradient) using all of the
+        # points.
+        Loss_Full = Loss_Functions.Data_Loss(
+                        Sol_NN      = u_NN,
+                        Data_Coords = Data_Coords,
+                        Data_Values = Data_Values);
+        Grads_Full = torch.autograd.grad(Loss_Full, Params);
+
+        # Now do what each process would do: evaluate the loss on its shard,
+        # and weight it by the fraction of the points in that shard. Summing
+        # these should give the full loss (and its gradient).
+        Loss_Sum  = torch.tensor(0, dtype = torch.float32);
+        Grads_Sum = [torch.zeros_like(Param) for Param in Params];
+        for Rank in range(World_Size):
+            (Coords_Shard, Weight) = Test_Train.Shard(Data_Coords, Rank, World_Size);
+            Values_Shard           = Test_Train.Shard(Data_Values, Rank, World_Size)[0];
+
+            Loss_Shard = Weight*Loss_Functions.Data_Loss(
+                                    Sol_NN      = u_NN,
+                                    Data_Coords = Coords_Shard,
+                                    Data_Values = Values_Shard);
+            Grads_Shard = torch.autograd.grad(Loss_Shard, Params);
+
+            Loss_Sum = Loss_Sum + Loss_Shard.detach();
+            for i in range(len(Params)):
+                Grads_Sum[i] += Grads_Shard[i];
+
+        # Finally, set up a one process group and pass the summed loss and
+        # gradients through Sum_Across_Ranks. This flattens them, sums them
+        # across the (one) process, and copies them back. The returned loss
+        # and the parameters' gradients should still match the full loss and
+        # its gradient.
+        for i in range(len(Params)):
+            Params[i].grad = Grads_Sum[i].clone();
+
+        with tempfile.TemporaryDirectory() as Init_Dir:
+            torch.distributed.init_process_group(
+                    backend     = "gloo",
+                    init_method = "file://" + os.path.join(Init_Dir, "Init_File"),
+                    rank        = 0,
+                    world_size  = 1);
+            try:
+                Loss_Actual = Test_Train.Sum_Across_Ranks(
+                                    Loss    = Loss_Sum,
+                                    Params  = Params);
+            finally:
+                torch.distributed.destroy_process_group();
+
+        self.assertLess(abs(Loss_Actual - Loss_Full).item(), Epsilon*max(1.0, Loss_Full.item()));
+        for i in range(len(Params)):
+            self.assertEqual(Params[i].grad.shape, Grads_Full[i].shape);
+            Scale : float = max(1.0, torch.max(torch.abs(Grads_Full[i])).item());
+            self.assertLess(torch.max(torch.abs(Params[i].grad - Grads_Full[i])).item(), Epsilon*Scale);
+
+
+
 if(__name__ == "__main__"):
     unittest.main();